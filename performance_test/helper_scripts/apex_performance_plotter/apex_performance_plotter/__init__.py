@@ -19,12 +19,15 @@
 
 """Tool for plotting performance test reports."""
 
+import io
 import itertools
 import os
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import click
 import pandas
@@ -45,10 +48,14 @@ def load_logfile(filename):
     """Load logfile into header dictionary and pandas dataframe."""
     with open(filename) as source:
         header = {
-            item.split(':')[0].strip(): item.split(':', maxsplit=1)[1].strip()
-            for item in itertools.takewhile(lambda x: not x.startswith('---'), source)
+            key.strip(): value.strip()
+            for key, _, value in (
+                item.partition(':')
+                for item in itertools.takewhile(lambda x: not x.startswith('---'), source)
+            )
         }
-        dataframe = pandas.read_csv(source, sep="[ \t]*,[ \t]*", engine='python')
+        # Fields are padded with tabs, which the C parser does not accept in front of inf or nan.
+        dataframe = pandas.read_csv(io.StringIO(source.read().replace('\t', '')), sep=',')
     return header, dataframe
 
 
@@ -86,6 +93,12 @@ def create_kv(dct, key, boolish=False):
     return {'key': sanitize(key), 'value': sanitize(dct[key])}
 
 
+def padded_range(traces, padding):
+    """Return the range spanned by all traces, widened by padding on both sides."""
+    values = [value for trace in traces for value in trace]
+    return [min(values) - padding, max(values) + padding]
+
+
 def create_layout(header, dataframe):
     """Create a rendering context for the jinja template."""
     header_fields = {
@@ -96,6 +109,7 @@ def create_layout(header, dataframe):
     }
 
     xaxis = dataframe.T_experiment.tolist()
+    xrange = padded_range([xaxis], 5)
     y11 = dataframe['latency_min (ms)'].tolist()
     y12 = dataframe['latency_max (ms)'].tolist()
     y13 = dataframe['latency_mean (ms)'].tolist()
@@ -127,15 +141,15 @@ def create_layout(header, dataframe):
                     {'name': 'mean', 'x': xaxis, 'y': y13},
                     {'name': 'variance * 100', 'x': xaxis, 'y': y14},
                 ],
-                'xrange': [min(xaxis) - 5, max(xaxis) + 5],
-                'yrange': [min([*y11, *y12, *y13, *y14]) - .5, max([*y11, *y12, *y13, *y14]) + .5],
+                'xrange': xrange,
+                'yrange': padded_range([y11, y12, y13, y14], .5),
                 'axis2': {
                     'ylabel': 'maxrss (MB)',
                     'traces': [
                         {'name': 'maxrss (MB)', 'x': xaxis, 'y': yr11},
                     ],
-                    'xrange': [min(xaxis) - 5, max(xaxis) + 5],
-                    'yrange': [min([*yr11]) - .5, max([*yr11]) + .5],
+                    'xrange': xrange,
+                    'yrange': padded_range([yr11], .5),
                 },
             },
             {
@@ -147,8 +161,8 @@ def create_layout(header, dataframe):
                     {'name': 'max', 'x': xaxis, 'y': y22},
                     {'name': 'nivcsw', 'x': xaxis, 'y': y23},
                 ],
-                'xrange': [min(xaxis) - 5, max(xaxis) + 5],
-                'yrange': [min([*y21, *y22, *y23]) - 2500, max([*y21, *y22, *y23]) + 2500],
+                'xrange': xrange,
+                'yrange': padded_range([y21, y22, y23], 2500),
                 'axis2': {
                     'traces': [
                     ],
@@ -195,11 +209,7 @@ def render(template, filename, skip_head=0, skip_tail=0):
 
         print('Running tex for {}'.format(filename))
         cmd = ['lualatex', '--interaction=nonstopmode', texname]
-        ret = subprocess.run(cmd, cwd=dirname, stdout=subprocess.PIPE)
-        if ret.returncode:
-            print(ret.stdout.decode('ascii'))
-            print('ERROR: Could not compile tex file.')
-            sys.exit(2)
+        subprocess.run(cmd, cwd=dirname, stdout=subprocess.PIPE, check=True)
 
         pdfname = os.path.join(dirname, '{}.pdf'.format(filename))
         shutil.copy(pdfname, os.path.dirname(os.path.abspath(filename)))
@@ -208,16 +218,37 @@ def render(template, filename, skip_head=0, skip_tail=0):
 @click.command()
 @click.option('--skip-head', default=0, help='Number of head rows to skip.')
 @click.option('--skip-tail', default=0, help='Number of tail rows to skip.')
+@click.option('--jobs', default=os.cpu_count() or 1, help='Number of files to render in parallel.')
 @click.argument('filenames', type=click.Path(exists=True), nargs=-1, required=True)
-def plot_logfiles(skip_head, skip_tail, filenames):
+def plot_logfiles(skip_head, skip_tail, jobs, filenames):
     """CLI entrypoint for plotting multiple files."""
     if not shutil.which('lualatex'):
         print('This tool requires lualatex, please install texlive.')
         sys.exit(1)
 
     template = load_template()
-    for filename in filenames:
-        render(template, filename, skip_head, skip_tail)
+    failed = threading.Event()
+
+    def render_file(filename):
+        """Render one file, unless rendering another file already failed."""
+        if failed.is_set():
+            return
+        try:
+            render(template, filename, skip_head, skip_tail)
+        except BaseException:
+            failed.set()
+            raise
+
+    # Rendering is dominated by the lualatex child processes, threads are enough to keep them busy.
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(render_file, filename): filename for filename in filenames}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except subprocess.CalledProcessError as error:
+                print(error.output.decode('ascii'))
+                print('ERROR: Could not compile tex file for {}.'.format(futures[future]))
+                sys.exit(2)
 
 
 if __name__ == '__main__':
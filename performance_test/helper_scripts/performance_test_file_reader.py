@@ -15,6 +15,7 @@
 # limitations under the License.
 
 # flake8: noqa This file is for plotting data. Its dependencies are not necessarily on the CI.
+import io
 import os
 import sys
 import numpy as np
@@ -31,9 +32,11 @@ def parse_file(file, single_file=None):
         return
     try:
         print("Parsing file:" + str(file))
-        dataframe = pd.read_csv(file, skiprows=N + 1, sep="[ \t]*,[ \t]*", engine='python')
         with open(file) as myfile:
             head = [next(myfile) for x in range(0, N)]
+            next(myfile)  # Skip the experiment start marker.
+            # Fields are padded with tabs, which the C parser does not accept in front of inf/nan.
+            dataframe = pd.read_csv(io.StringIO(myfile.read().replace("\t", "")), sep=",")
 
         if not dataframe.empty:
             pd.options.display.float_format = '{:.4f}'.format
@@ -58,9 +61,28 @@ def parse_file(file, single_file=None):
                             bbox_inches=matplotlib.transforms.Bbox(np.array(((0, 0), (8, 8)))))
             else:
                 single_file.savefig(bbox_inches=matplotlib.transforms.Bbox(np.array(((0, 0), (8, 8)))))
-            plt.close('all')
     except:  # noqa: E722 I do rethrow.
         print("Could not parse file: " + str(file) + "\n")
+    finally:
+        # Also release the figure of a file that failed half way, pyplot keeps it alive otherwise.
+        plt.close('all')
+
+
+def find_logfiles(directory):
+    """Recursively yield the log files below directory, files before subdirectories."""
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        # Like os.walk, skip directories which cannot be read.
+        return
+    subdirs = []
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            subdirs.append(entry.path)
+        elif entry.is_file() and entry.name.startswith("log_") and not entry.name.endswith(".pdf"):
+            yield entry.path
+    for subdir in subdirs:
+        yield from find_logfiles(subdir)
 
 
 pdf = None
@@ -79,12 +101,11 @@ logfiles = []
 N = 17  # Number of line to skip before CSV data starts.
 
 # If the given directory actually a file.
-os.path.isfile(directory)
-parse_file(os.path.join(os.path.dirname(directory), os.path.basename(directory)), pdf)
-
-for root, subdirs, files in os.walk(directory):
-    for file in files:
-        parse_file(os.path.join(root, file), pdf)
+if os.path.isfile(directory):
+    parse_file(directory, pdf)
+else:
+    for file in find_logfiles(directory):
+        parse_file(file, pdf)
 
 if pdf is not None:
     pdf.close()
@@ -49,22 +49,24 @@ class Instance:
         reliability = ['', '--reliable']
         durability = ['', '--transient']
 
-        self.product = list(itertools.product(topics, rates, num_subs, reliability, durability))
+        self.configurations = itertools.product(topics, rates, num_subs, reliability, durability)
+        self.num_configurations = \
+            len(topics) * len(rates) * len(num_subs) * len(reliability) * len(durability)
         self.process = None
 
         self.type = operation_type
 
-    def run(self, index):
-        """
-        Run the embedded perf_test process.
+    def run(self):
+        """Run the embedded perf_test process with the next test configuration."""
+        command = self.cmd(next(self.configurations))
 
-        :param index: The test configuration to run.
-        """
         print('*******************')
-        print(self.cmd(index))
+        print(' '.join(command))
         print('*******************')
 
-        self.process = subprocess.Popen(self.cmd(index), shell=True)
+        # Start in a new session so the whole process group, including perf_test spawned by
+        # ros2 run, can be killed at once.
+        self.process = subprocess.Popen(command, start_new_session=True)
 
         # Comment out the following lines to run the experiments with soft realtime priority.
         # We sleeping here to make sure the process is started before changing its priority.
@@ -72,46 +74,51 @@ class Instance:
         # Enabling (pseudo-)realtime
         # subprocess.Popen('chrt -p 99 $(ps -o pid -C 'perf_test' --no-headers)', shell=True)
 
-    def cmd(self, index):
+    def cmd(self, configuration):
         """
         Return the command line necessary to execute the performance test.
 
-        :param index: The test configuration the returned command line should contain.
-        :return: The command line argument to execute the performance test.
+        :param configuration: The test configuration the returned command line should contain.
+        :return: The command line arguments to execute the performance test.
         """
-        command = 'ros2 run  performance_test perf_test'
+        command = ['ros2', 'run', 'performance_test', 'perf_test']
 
-        c = list(self.product[index])
+        c = list(configuration)
 
         if self.type == Type.PUBLISHER:
             c[2] = '0'
-            pubs_args = ' -p1 '
+            pubs_args = '-p1'
         elif self.type == Type.SUBSCRIBER:
-            pubs_args = ' -p0 '
+            pubs_args = '-p0'
         elif self.type == Type.BOTH:
-            pubs_args = ' -p1 '
+            pubs_args = '-p1'
         else:
             raise ValueError('Unsupported type')
 
-        dir_name = 'rate_' + c[1] + '/subs_' + c[2]
+        dir_name = 'rate_{}/subs_{}'.format(c[1], c[2])
 
         if not os.path.exists(dir_name):
             os.makedirs(dir_name)
-        fixed_args = ' --communication ROS2 '
-        dyn_args = \
-            '-l \'' + dir_name + '/log\' ' + '--topic ' + \
-            c[0] + ' --rate ' + c[1] + ' -s ' + c[2] + ' ' + c[3] + ' ' + c[4]
 
-        return command + ' ' + fixed_args + dyn_args + pubs_args
+        args = ['--communication', 'ROS2', '-l', '{}/log'.format(dir_name), '--topic', c[0],
+                '--rate', c[1], '-s', c[2], c[3], c[4], pubs_args]
+
+        # The optional QoS flags are empty strings when disabled, they must not end up as argv.
+        return command + [arg for arg in args if arg]
 
     def kill(self):
-        """Kill the associated performance test process."""
+        """Kill the process group of the associated performance test process."""
         if self.process is not None:
-            self.process.kill()
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            self.process.wait()
+            self.process = None
 
     def num_runs(self):
         """Return the number of experiments runs this instance can execute."""
-        return len(self.product)
+        return self.num_configurations
 
     def __del__(self):
         self.kill()
@@ -132,7 +139,7 @@ full_list = pub_list + sub_list + both_list
 def signal_handler(sig, frame):
     """Signal handler to handle Ctrl-C."""
     print('You pressed Ctrl+C! Terminating experiment')
-    subprocess.Popen('killall perf_test', shell=True)
+    [e.kill() for e in full_list]
     sys.exit(0)
 
 
@@ -142,13 +149,12 @@ def timer_handler(sig=None, frame=None):
     global full_list
 
     [e.kill() for e in full_list]
-    subprocess.Popen('killall -9 perf_test', shell=True)
-    current_index = current_index + 1
     if current_index >= full_list[0].num_runs():
         print('Done with experiments.')
         exit(0)
     else:
-        [e.run(current_index) for e in full_list]
+        [e.run() for e in full_list]
+        current_index = current_index + 1
 
 
 signal.signal(signal.SIGALRM, timer_handler)